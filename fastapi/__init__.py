@@ -2,11 +2,37 @@
 
 __version__ = "0.115.14"
 
+# Private aliases keep helper imports out of the package namespace
+import importlib as _importlib
+import typing as _typing
+
 from starlette import status as status
 
-from ._rust
-from .applications import FastAPI as FastAPI
-from .routing
-from .params
-from .encoders
-from .utils
+if _typing.TYPE_CHECKING:  # pragma: no cover
+    from . import _rust as _rust
+    from .applications import FastAPI as FastAPI
+
+# Public name -> (module, attribute), imported on first access (PEP 562).
+# An attribute of None binds the module itself.
+_LAZY: _typing.Dict[str, _typing.Tuple[str, _typing.Optional[str]]] = {
+    "_rust": ("fastapi._rust", None),
+    "FastAPI": ("fastapi.applications", "FastAPI"),
+}
+
+
+def __getattr__(name: str) -> _typing.Any:
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    module = _importlib.import_module(module_name)
+    value = module if attr is None else getattr(module, attr)
+    # Cache in the module namespace so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> _typing.List[str]:
+    return sorted(["__version__", "status", *_LAZY])
@@ -1 +1,153 @@
-# Python-Rust bridge module
\ No newline at end of file
+"""Bridge to the optional ``_fastapi_rust`` extension module.
+
+The extension is probed exactly once, when this module is imported. Callers
+resolve functions with ``get_rust_function`` and pass a pure-Python fallback
+for installs where the extension is missing.
+"""
+
+import hmac
+import importlib
+import operator
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Tuple
+
+RUST_MODULE_NAME = "fastapi._fastapi_rust"
+
+_check_required_attrs = operator.attrgetter(
+    "init_rust_backend",
+    "create_api_route",
+    "jsonable_encoder",
+    "constant_time_compare",
+)
+
+
+class RustExtensionError(ImportError):
+    pass
+
+
+def _probe_rust_module() -> Optional[ModuleType]:
+    try:
+        module = importlib.import_module(RUST_MODULE_NAME)
+        _check_required_attrs(module)
+    except (ImportError, AttributeError):
+        return None
+    if not module.init_rust_backend():
+        return None
+    return module
+
+
+_RUST_FUNCTION_NAMES = (
+    "init_rust_backend",
+    "create_api_route",
+    "match_route",
+    "compile_path_regex",
+    "compile_schema",
+    "validate_path_params",
+    "validate_query_params",
+    "validate_header_params",
+    "validate_request_params",
+    "validate_body_params",
+    "jsonable_encoder",
+    "serialize_response",
+    "deserialize_request",
+    "constant_time_compare",
+    "verify_api_key",
+    "hash_password",
+    "generate_unique_id",
+    "parse_content_type",
+    "convert_python_type",
+)
+
+
+def _build_function_table(
+    module: Optional[ModuleType],
+) -> Dict[str, Callable[..., Any]]:
+    if module is None:
+        return {}
+    table = {}
+    for name in _RUST_FUNCTION_NAMES:
+        function = getattr(module, name, None)
+        if function is not None:
+            table[name] = function
+    return table
+
+
+_RUST_MOD: Optional[ModuleType] = _probe_rust_module()
+_RUST_OK: bool = _RUST_MOD is not None
+_FN_TABLE: Dict[str, Callable[..., Any]] = _build_function_table(_RUST_MOD)
+
+
+def rust_available() -> bool:
+    return _RUST_OK
+
+
+def get_rust_function(
+    function_name: str, fallback: Optional[Callable[..., Any]] = None
+) -> Callable[..., Any]:
+    function = _FN_TABLE.get(function_name)
+    if function is not None:
+        return function
+    if fallback is None:
+        raise RustExtensionError(
+            f"Rust function {function_name!r} is not available"
+        )
+    return fallback
+
+
+def cleanup_rust_resources() -> None:
+    global _RUST_MOD, _RUST_OK, _FN_TABLE
+    global constant_time_compare, verify_api_key, parse_content_type
+    _RUST_MOD = None
+    _RUST_OK = False
+    _FN_TABLE = {}
+    # The module-level helpers were bound at import time; point them back at
+    # the pure-Python versions so nothing keeps calling into the extension
+    constant_time_compare = _py_constant_time_compare
+    verify_api_key = _py_verify_api_key
+    parse_content_type = _py_parse_content_type
+
+
+def _py_constant_time_compare(a: str, b: str) -> bool:
+    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
+
+
+def _py_verify_api_key(
+    provided_key: str, expected_key: str, algorithm: Optional[str] = None
+) -> bool:
+    if algorithm not in (None, "plain", "sha256", "bcrypt"):
+        raise ValueError(f"Invalid algorithm: {algorithm}")
+    return _py_constant_time_compare(provided_key, expected_key)
+
+
+def _py_parse_content_type(content_type: str) -> Tuple[str, Dict[str, str]]:
+    # Single left-to-right scan with str.find; no intermediate lists
+    length = len(content_type)
+    end = content_type.find(";")
+    if end == -1:
+        end = length
+    media_type = content_type[:end].strip().lower()
+    if not media_type:
+        raise ValueError("Missing media type")
+    parameters = {}
+    while end < length:
+        start = end + 1
+        end = content_type.find(";", start)
+        if end == -1:
+            end = length
+        eq = content_type.find("=", start, end)
+        if eq != -1:
+            key = content_type[start:eq].strip().lower()
+            parameters[key] = content_type[eq + 1 : end].strip().strip('"')
+    return media_type, parameters
+
+
+# Bound once at import so call sites skip the bridge lookup entirely
+constant_time_compare = get_rust_function(
+    "constant_time_compare", fallback=_py_constant_time_compare
+)
+verify_api_key = get_rust_function(
+    "verify_api_key", fallback=_py_verify_api_key
+)
+parse_content_type = get_rust_function(
+    "parse_content_type", fallback=_py_parse_content_type
+)
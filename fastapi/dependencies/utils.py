@@ -1,4 +1,5 @@
 import inspect
+import weakref
 from contextlib import AsyncExitStack, contextmanager
 from copy import copy, deepcopy
 from dataclasses import dataclass
@@ -228,7 +229,28 @@ def get_flat_params(dependant: Dependant) -> List[ModelField]:
     return path_params + query_params + header_params + cookie_params
 
 
+# Routes sharing an endpoint or dependency, and dependency overrides resolved
+# per request, would otherwise repeat the same introspection every time. Keys
+# are weak so overrides and per-app dependency instances can still be freed.
+_typed_signature_cache: (
+    "weakref.WeakKeyDictionary[Callable[..., Any], inspect.Signature]"
+) = weakref.WeakKeyDictionary()
+
+
 def get_typed_signature(call: Callable[..., Any]) -> inspect.Signature:
+    try:
+        return _typed_signature_cache[call]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable or not weakly referenceable, e.g. builtins
+        return _build_typed_signature(call)
+    typed_signature = _build_typed_signature(call)
+    _typed_signature_cache[call] = typed_signature
+    return typed_signature
+
+
+def _build_typed_signature(call: Callable[..., Any]) -> inspect.Signature:
     signature = inspect.signature(call)
     globalns = getattr(call, "__globals__", {})
     typed_params = [
@@ -1 +1,2 @@
-# (Python wrapper) Routes to Rust security
\ No newline at end of file
+from fastapi._rust import constant_time_compare as constant_time_compare
+from fastapi._rust import verify_api_key as verify_api_key
@@ -1,8 +1,8 @@
-use regex::Regex;
+use regex::{Regex, RegexSet};
 use std::collections::HashMap;
 use std::sync::Arc;
 use dashmap::DashMap;
-use once_cell::sync::Lazy;
+use once_cell::sync::{Lazy, OnceCell};
 use smallvec::SmallVec;
 use ahash::AHashMap;
 use thiserror::Error;
@@ -20,9 +20,15 @@ pub enum RoutingError {
 pub type Result<T> = std::result::Result<T, RoutingError>;
 
 static REGEX_CACHE: Lazy<DashMap<String, Arc<Regex>>> = Lazy::new(DashMap::new);
-static PATH_PARAM_REGEX: Lazy<Regex> = Lazy::new(|| {
-    Regex::new(r"\{([^}:]+)(?::([^}]+))?\}").unwrap()
-});
+static PATH_CACHE: Lazy<DashMap<String, Arc<CompiledPath>>> = Lazy::new(DashMap::new);
+
+/// Everything derived from a path template, shared by all routes using it
+#[derive(Debug)]
+struct CompiledPath {
+    regex: Arc<Regex>,
+    param_names: SmallVec<[String; 4]>,
+    path_format: String,
+}
 
 #[derive(Debug, Clone)]
 pub struct Route {
@@ -36,18 +42,42 @@ pub struct Route {
 
 impl Route {
     pub fn new(path: &str, methods: Vec<String>, name: Option<String>) -> Result<Self> {
-        let (regex_pattern, param_names, path_format) = compile_path_pattern(path)?;
-        let regex = get_or_compile_regex(&regex_pattern)?;
+        let compiled = get_or_compile_path(path)?;
         
         Ok(Route {
             path: path.to_string(),
             methods: methods.into(),
             name,
-            regex,
-            param_names,
-            path_format,
+            regex: compiled.regex.clone(),
+            param_names: compiled.param_names.clone(),
+            path_format: compiled.path_format.clone(),
         })
     }
+
+    /// Match `path` and `method` in a single pass, returning the captured
+    /// path parameters on success.
+    pub fn match_path(&self, path: &str, method: &str) -> Option<HashMap<String, String>> {
+        if !self.methods.iter().any(|m| m == method) {
+            return None;
+        }
+
+        // Routes without parameters compile to an escaped literal, so a plain
+        // string comparison gives the same answer without running the regex
+        if self.param_names.is_empty() {
+            return (path == self.path).then(HashMap::new);
+        }
+
+        let captures = self.regex.captures(path)?;
+        let mut params = HashMap::with_capacity(self.param_names.len());
+
+        for (i, param_name) in self.param_names.iter().enumerate() {
+            if let Some(capture) = captures.get(i + 1) {
+                params.insert(param_name.clone(), capture.as_str().to_string());
+            }
+        }
+
+        Some(params)
+    }
 }
 
 pub fn create_route(path: &str, methods: Vec<String>, name: Option<String>) -> Result<Route> {
@@ -59,36 +89,29 @@ pub fn match_route(
     method: &str,
     routes: &[Route],
 ) -> Option<(usize, HashMap<String, String>)> {
-    for (idx, route) in routes.iter().enumerate() {
-        if !route.methods.iter().any(|m| m == method) {
-            continue;
-        }
-        
-        if let Some(captures) = route.regex.captures(path) {
-            let mut params = HashMap::with_capacity(route.param_names.len());
-            
-            for (i, param_name) in route.param_names.iter().enumerate() {
-                if let Some(capture) = captures.get(i + 1) {
-                    params.insert(param_name.clone(), capture.as_str().to_string());
-                }
-            }
-            
-            return Some((idx, params));
-        }
-    }
-    None
+    routes
+        .iter()
+        .enumerate()
+        .find_map(|(idx, route)| route.match_path(path, method).map(|params| (idx, params)))
 }
 
+/// Build the regex source for `path` without caching it; only paths
+/// registered through `Route::new` are kept in `PATH_CACHE`
 pub fn compile_path_regex(path: &str) -> Result<String> {
-    let (pattern, _, _) = compile_path_pattern(path)?;
-    Ok(pattern)
+    compile_path_pattern(path).map(|(pattern, _, _)| pattern)
 }
 
 fn compile_path_pattern(path: &str) -> Result<(String, SmallVec<[String; 4]>, String)> {
     if !path.starts_with('/') {
         return Err(RoutingError::InvalidPath("Path must start with '/'".to_string()));
     }
-    
+
+    // Static paths have nothing to scan for
+    if !path.contains('{') {
+        let pattern = format!("^{}$", regex::escape(path));
+        return Ok((pattern, SmallVec::new(), path.to_string()));
+    }
+
     let mut pattern = String::with_capacity(path.len() * 2);
     let mut param_names = SmallVec::new();
     let mut path_format = String::with_capacity(path.len());
@@ -96,13 +119,11 @@ fn compile_path_pattern(path: &str) -> Result<(String, SmallVec<[String; 4]>, St
     
     pattern.push('^');
     
-    for cap in PATH_PARAM_REGEX.captures_iter(path) {
-        let full_match = cap.get(0).unwrap();
-        let param_name = cap.get(1).unwrap().as_str();
-        let param_type = cap.get(2).map(|m| m.as_str()).unwrap_or("str");
+    while let Some((start, end, param_name, param_type)) = next_placeholder(path, last_end) {
+        let param_type = param_type.unwrap_or("str");
         
-        pattern.push_str(&regex::escape(&path[last_end..full_match.start()]));
-        path_format.push_str(&path[last_end..full_match.start()]);
+        pattern.push_str(&regex::escape(&path[last_end..start]));
+        path_format.push_str(&path[last_end..start]);
         
         let regex_part = match param_type {
             "int" => r"([0-9]+)",
@@ -118,7 +139,7 @@ fn compile_path_pattern(path: &str) -> Result<(String, SmallVec<[String; 4]>, St
         path_format.push('}');
         param_names.push(param_name.to_string());
         
-        last_end = full_match.end();
+        last_end = end;
     }
     
     pattern.push_str(&regex::escape(&path[last_end..]));
@@ -128,6 +149,46 @@ fn compile_path_pattern(path: &str) -> Result<(String, SmallVec<[String; 4]>, St
     Ok((pattern, param_names, path_format))
 }
 
+/// Find the first `{name}` or `{name:type}` placeholder at or after `from`,
+/// returning its byte range, name and optional type. A brace pair with an
+/// empty name or type is literal text, and scanning resumes after its `{`.
+fn next_placeholder(path: &str, from: usize) -> Option<(usize, usize, &str, Option<&str>)> {
+    let mut search = from;
+    
+    while let Some(offset) = path[search..].find('{') {
+        let start = search + offset;
+        let inner_len = path[start + 1..].find('}')?;
+        let inner = &path[start + 1..start + 1 + inner_len];
+        
+        let (name, param_type) = match inner.split_once(':') {
+            Some((name, param_type)) => (name, Some(param_type)),
+            None => (inner, None),
+        };
+        if !name.is_empty() && param_type.map_or(true, |t| !t.is_empty()) {
+            return Some((start, start + inner_len + 2, name, param_type));
+        }
+        
+        search = start + 1;
+    }
+    
+    None
+}
+
+fn get_or_compile_path(path: &str) -> Result<Arc<CompiledPath>> {
+    if let Some(cached) = PATH_CACHE.get(path) {
+        return Ok(cached.clone());
+    }
+    
+    let (regex_pattern, param_names, path_format) = compile_path_pattern(path)?;
+    let compiled = Arc::new(CompiledPath {
+        regex: get_or_compile_regex(&regex_pattern)?,
+        param_names,
+        path_format,
+    });
+    PATH_CACHE.insert(path.to_string(), compiled.clone());
+    Ok(compiled)
+}
+
 fn get_or_compile_regex(pattern: &str) -> Result<Arc<Regex>> {
     if let Some(cached) = REGEX_CACHE.get(pattern) {
         return Ok(cached.clone());
@@ -138,5 +199,175 @@ fn get_or_compile_regex(pattern: &str) -> Result<Arc<Regex>> {
     Ok(regex)
 }
 
+/// Routes in registration order, with parameterless paths also indexed by
+/// their literal path so most lookups never touch a regex.
 #[derive(Default)]
-pub struct RouteTree {
\ No newline at end of file
+pub struct RouteTree {
+    routes: Vec<Route>,
+    static_routes: AHashMap<String, SmallVec<[usize; 2]>>,
+    dynamic_routes: Vec<usize>,
+    /// All dynamic route patterns in one automaton, built on first match
+    /// after the last insert; `None` if the set exceeds the regex size limit
+    dynamic_set: OnceCell<Option<RegexSet>>,
+}
+
+impl RouteTree {
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// Append `route`, returning its index
+    pub fn insert(&mut self, route: Route) -> usize {
+        let idx = self.routes.len();
+        
+        if route.param_names.is_empty() {
+            self.static_routes
+                .entry(route.path.clone())
+                .or_default()
+                .push(idx);
+        } else {
+            self.dynamic_routes.push(idx);
+            self.dynamic_set = OnceCell::new();
+        }
+        
+        self.routes.push(route);
+        idx
+    }
+
+    pub fn get(&self, idx: usize) -> Option<&Route> {
+        self.routes.get(idx)
+    }
+
+    pub fn len(&self) -> usize {
+        self.routes.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.routes.is_empty()
+    }
+
+    /// Same result as `match_route` over the routes in insertion order: the
+    /// first registered route matching `path` and `method` wins.
+    pub fn match_route(
+        &self,
+        path: &str,
+        method: &str,
+    ) -> Option<(usize, HashMap<String, String>)> {
+        let static_idx = self.static_routes.get(path).and_then(|candidates| {
+            candidates
+                .iter()
+                .copied()
+                .find(|&idx| self.routes[idx].methods.iter().any(|m| m == method))
+        });
+        
+        // A parameterised route registered before the static hit still takes
+        // precedence, so only those need their regex run
+        let bound = static_idx.unwrap_or(usize::MAX);
+        let try_route = |idx: usize| {
+            self.routes[idx]
+                .match_path(path, method)
+                .map(|params| (idx, params))
+        };
+        
+        // One pass over the combined set finds every candidate, so only
+        // routes whose pattern matches are captured individually
+        let dynamic_match = match self.dynamic_set() {
+            Some(set) => set
+                .matches(path)
+                .iter()
+                .map(|i| self.dynamic_routes[i])
+                .take_while(|&idx| idx < bound)
+                .find_map(try_route),
+            None => self
+                .dynamic_routes
+                .iter()
+                .copied()
+                .take_while(|&idx| idx < bound)
+                .find_map(try_route),
+        };
+        
+        dynamic_match.or_else(|| static_idx.map(|idx| (idx, HashMap::new())))
+    }
+
+    fn dynamic_set(&self) -> Option<&RegexSet> {
+        self.dynamic_set
+            .get_or_init(|| {
+                RegexSet::new(
+                    self.dynamic_routes
+                        .iter()
+                        .map(|&idx| self.routes[idx].regex.as_str()),
+                )
+                .ok()
+            })
+            .as_ref()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn methods(list: &[&str]) -> Vec<String> {
+        list.iter().map(|m| m.to_string()).collect()
+    }
+
+    #[test]
+    fn test_compile_path_placeholders() {
+        let (pattern, params, path_format) =
+            compile_path_pattern("/items/{id:int}/{name}/{:x}").unwrap();
+        
+        assert_eq!(pattern, r"^/items/([0-9]+)/([^/]+)/\{:x\}$");
+        assert_eq!(params.as_slice(), ["id", "name"]);
+        assert_eq!(path_format, "/items/{id}/{name}/{:x}");
+    }
+
+    #[test]
+    fn test_compile_path_regex_is_not_cached() {
+        let path = "/uncached/{id:int}";
+        
+        assert_eq!(compile_path_regex(path).unwrap(), r"^/uncached/([0-9]+)$");
+        assert!(!PATH_CACHE.contains_key(path));
+    }
+
+    #[test]
+    fn test_route_tree_static_and_dynamic() {
+        let mut tree = RouteTree::new();
+        tree.insert(Route::new("/users/me", methods(&["GET"]), None).unwrap());
+        tree.insert(Route::new("/users/{id:int}", methods(&["GET"]), None).unwrap());
+        
+        assert_eq!(
+            tree.match_route("/users/me", "GET"),
+            Some((0, HashMap::new()))
+        );
+        
+        let (idx, params) = tree.match_route("/users/42", "GET").unwrap();
+        assert_eq!(idx, 1);
+        assert_eq!(params.get("id").map(String::as_str), Some("42"));
+        
+        assert!(tree.match_route("/users/me", "POST").is_none());
+    }
+
+    #[test]
+    fn test_route_tree_keeps_registration_order() {
+        let mut tree = RouteTree::new();
+        tree.insert(Route::new("/items/{name}", methods(&["GET"]), None).unwrap());
+        tree.insert(Route::new("/items/special", methods(&["GET"]), None).unwrap());
+        
+        let (idx, _) = tree.match_route("/items/special", "GET").unwrap();
+        assert_eq!(idx, 0);
+    }
+
+    #[test]
+    fn test_route_tree_skips_method_mismatch() {
+        let mut tree = RouteTree::new();
+        tree.insert(Route::new("/files/{name}", methods(&["POST"]), None).unwrap());
+        tree.insert(Route::new("/files/{path:path}", methods(&["GET"]), None).unwrap());
+        
+        let (idx, params) = tree.match_route("/files/a/b.txt", "GET").unwrap();
+        assert_eq!(idx, 1);
+        assert_eq!(params.get("path").map(String::as_str), Some("a/b.txt"));
+        
+        let (idx, _) = tree.match_route("/files/report", "POST").unwrap();
+        assert_eq!(idx, 0);
+    }
+}
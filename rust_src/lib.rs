@@ -25,9 +25,11 @@ fn _fastapi_rust(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(compile_path_regex, m)?)?;
 
     // Parameter validation functions
+    m.add_function(wrap_pyfunction!(compile_schema, m)?)?;
     m.add_function(wrap_pyfunction!(validate_path_params, m)?)?;
     m.add_function(wrap_pyfunction!(validate_query_params, m)?)?;
     m.add_function(wrap_pyfunction!(validate_header_params, m)?)?;
+    m.add_function(wrap_pyfunction!(validate_request_params, m)?)?;
     m.add_function(wrap_pyfunction!(validate_body_params, m)?)?;
 
     // Serialization functions
@@ -47,7 +49,9 @@ fn _fastapi_rust(m: &Bound<'_, PyModule>) -> PyResult<()> {
 
     // Type system
     m.add_class::<types::FastApiRoute>()?;
+    m.add_class::<types::FastApiRouteTree>()?;
     m.add_class::<types::ValidationResult>()?;
+    m.add_class::<types::CompiledSchema>()?;
     m.add_class::<types::RequestData>()?;
 
     Ok(())
@@ -1,7 +1,9 @@
+use dashmap::DashMap;
 use once_cell::sync::Lazy;
 use regex::Regex;
 use serde_json::Value;
 use std::collections::HashMap;
+use std::sync::Arc;
 use thiserror::Error;
 
 #[derive(Error, Debug)]
@@ -66,10 +68,36 @@ impl ValidationResult {
     }
 }
 
+/// Parameter type, resolved from the schema's type name once at compile time
+/// so validation does not compare strings for every value
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ParamType {
+    String,
+    Integer,
+    Number,
+    Boolean,
+    Email,
+    Uuid,
+}
+
+impl ParamType {
+    /// Unknown type names validate as plain strings
+    pub fn parse(name: &str) -> Self {
+        match name {
+            "integer" | "int" => ParamType::Integer,
+            "number" | "float" => ParamType::Number,
+            "boolean" | "bool" => ParamType::Boolean,
+            "email" => ParamType::Email,
+            "uuid" => ParamType::Uuid,
+            _ => ParamType::String,
+        }
+    }
+}
+
 #[derive(Debug, Clone)]
 pub struct ParameterSchema {
     pub name: String,
-    pub param_type: String,
+    pub param_type: ParamType,
     pub required: bool,
     pub default: Option<Value>,
     pub min_length: Option<usize>,
@@ -77,14 +105,19 @@ pub struct ParameterSchema {
     pub minimum: Option<f64>,
     pub maximum: Option<f64>,
     pub pattern: Option<String>,
+    /// The source given to `with_pattern` and the outcome of compiling it,
+    /// failures included, so an invalid pattern is not recompiled per value.
+    /// Only trusted while it still matches `pattern`, which stays public and
+    /// may be reassigned.
+    pattern_regex: Option<(String, std::result::Result<Arc<Regex>, regex::Error>)>,
     pub enum_values: Option<Vec<String>>,
 }
 
 impl ParameterSchema {
-    pub fn new(name: String, param_type: String) -> Self {
+    pub fn new(name: String, param_type: &str) -> Self {
         Self {
             name,
-            param_type,
+            param_type: ParamType::parse(param_type),
             required: false,
             default: None,
             min_length: None,
@@ -92,6 +125,7 @@ impl ParameterSchema {
             minimum: None,
             maximum: None,
             pattern: None,
+            pattern_regex: None,
             enum_values: None,
         }
     }
@@ -119,6 +153,7 @@ impl ParameterSchema {
     }
 
     pub fn with_pattern(mut self, pattern: String) -> Self {
+        self.pattern_regex = Some((pattern.clone(), get_or_compile_pattern(&pattern)));
         self.pattern = Some(pattern);
         self
     }
@@ -127,6 +162,15 @@ impl ParameterSchema {
         self.enum_values = Some(values);
         self
     }
+
+    /// The compiled form of `pattern`: the result recorded by `with_pattern`
+    /// when it is still current, otherwise a lookup in the shared pattern cache
+    fn compiled_pattern(&self, pattern: &str) -> std::result::Result<Arc<Regex>, regex::Error> {
+        match &self.pattern_regex {
+            Some((source, compiled)) if source == pattern => compiled.clone(),
+            _ => get_or_compile_pattern(pattern),
+        }
+    }
 }
 
 static EMAIL_REGEX: Lazy<Regex> =
@@ -136,84 +180,78 @@ static UUID_REGEX: Lazy<Regex> = Lazy::new(|| {
     Regex::new(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$").unwrap()
 });
 
+static PATTERN_CACHE: Lazy<DashMap<String, Arc<Regex>>> = Lazy::new(DashMap::new);
+
 pub fn validate_path_params(
     params: HashMap<String, String>,
-    schema: HashMap<String, Value>,
+    schemas: &[ParameterSchema],
 ) -> Result<ValidationResult> {
-    let schemas = parse_schema_map(schema)?;
-    validate_parameters(
-        params.into_iter().map(|(k, v)| (k, vec![v])).collect(),
-        schemas,
-    )
+    validate_parameters(params, schemas)
 }
 
 pub fn validate_query_params(
     params: HashMap<String, String>,
-    schema: HashMap<String, Value>,
+    schemas: &[ParameterSchema],
 ) -> Result<ValidationResult> {
-    let schemas = parse_schema_map(schema)?;
-    validate_parameters(
-        params.into_iter().map(|(k, v)| (k, vec![v])).collect(),
-        schemas,
-    )
+    validate_parameters(params, schemas)
 }
 
+/// `headers` must already be keyed by schema name; the Python binding
+/// matches header names case-insensitively while extracting them, so
+/// unrelated headers are never converted or copied.
 pub fn validate_header_params(
     headers: HashMap<String, String>,
-    schema: HashMap<String, Value>,
+    schemas: &[ParameterSchema],
 ) -> Result<ValidationResult> {
-    let schemas = parse_schema_map(schema)?;
-    let normalized_headers: HashMap<String, Vec<String>> = headers
-        .into_iter()
-        .map(|(k, v)| (k.to_lowercase(), vec![v]))
-        .collect();
-    validate_parameters(normalized_headers, schemas)
+    validate_parameters(headers, schemas)
 }
 
 pub fn validate_body_params(
-    body: Vec<u8>,
+    body: &[u8],
     schema: HashMap<String, Value>,
 ) -> Result<ValidationResult> {
-    let body_str = std::str::from_utf8(&body).map_err(|_| ValidationError::InvalidFormat {
-        param: "body".to_string(),
-        value: "Invalid UTF-8".to_string(),
-    })?;
-
-    let json_value: Value =
-        serde_json::from_str(body_str).map_err(|_| ValidationError::InvalidFormat {
+    // Parse straight from the borrowed bytes; serde_json checks UTF-8 itself,
+    // so only the error path needs to tell the two failure modes apart.
+    let json_value: Value = serde_json::from_slice(body).map_err(|_| {
+        let value = if std::str::from_utf8(body).is_err() {
+            "Invalid UTF-8"
+        } else {
+            "Invalid JSON"
+        };
+        ValidationError::InvalidFormat {
             param: "body".to_string(),
-            value: "Invalid JSON".to_string(),
-        })?;
+            value: value.to_string(),
+        }
+    })?;
 
     validate_json_against_schema(json_value, schema)
 }
 
 fn validate_parameters(
-    params: HashMap<String, Vec<String>>,
-    schemas: Vec<ParameterSchema>,
+    params: HashMap<String, String>,
+    schemas: &[ParameterSchema],
 ) -> Result<ValidationResult> {
-    let mut result = ValidationResult::success(HashMap::new());
+    let mut result = ValidationResult::success(HashMap::with_capacity(schemas.len()));
 
     for schema in schemas {
         match params.get(&schema.name) {
-            Some(values) if !values.is_empty() => {
-                let value = &values[0]; // Take first value for now
-                match validate_single_parameter(value, &schema) {
-                    Ok(validated_value) => {
-                        result
-                            .validated_data
-                            .insert(schema.name.clone(), validated_value);
-                    }
-                    Err(error) => {
-                        result.add_error(error);
-                    }
+            Some(value) => match validate_single_parameter(value, schema) {
+                Ok(validated_value) => {
+                    result
+                        .validated_data
+                        .insert(schema.name.clone(), validated_value);
                 }
-            }
+                Err(error) => {
+                    result.add_error(error);
+                }
+            },
             _ => {
                 if schema.required {
                     result.add_error(ValidationError::MissingRequired(schema.name.clone()));
-                } else if let Some(default) = schema.default {
-                    result.validated_data.insert(schema.name.clone(), default);
+                } else if let Some(default) = &schema.default {
+                    result
+                        .validated_data
+                        .insert(schema.name.clone(), default.clone());
                 }
             }
         }
@@ -224,57 +262,67 @@ fn validate_parameters(
 
 fn validate_single_parameter(value: &str, schema: &ParameterSchema) -> Result<Value> {
     // Type validation and conversion
-    let converted_value =
-        match schema.param_type.as_str() {
-            "string" | "str" => Value::String(value.to_string()),
-            "integer" | "int" => value.parse::<i64>().map(Value::Number).map_err(|_| {
-                ValidationError::InvalidType {
-                    param: schema.name.clone(),
-                    expected: "integer".to_string(),
-                    actual: value.to_string(),
-                }
+    let converted_value = match schema.param_type {
+        ParamType::String => Value::String(value.to_string()),
+        ParamType::Integer => value
+            .parse::<i64>()
+            .map(|n| Value::Number(n.into()))
+            .map_err(|_| ValidationError::InvalidType {
+                param: schema.name.clone(),
+                expected: "integer".to_string(),
+                actual: value.to_string(),
+            })?,
+        // "nan" and "inf" parse as f64 but have no JSON number form
+        ParamType::Number => value
+            .parse::<f64>()
+            .ok()
+            .and_then(serde_json::Number::from_f64)
+            .map(Value::Number)
+            .ok_or_else(|| ValidationError::InvalidType {
+                param: schema.name.clone(),
+                expected: "number".to_string(),
+                actual: value.to_string(),
             })?,
-            "number" | "float" => value
-                .parse::<f64>()
-                .map(|f| Value::Number(serde_json::Number::from_f64(f).unwrap()))
-                .map_err(|_| ValidationError::InvalidType {
+        ParamType::Boolean => {
+            if ["true", "1", "yes", "on"]
+                .iter()
+                .any(|t| value.eq_ignore_ascii_case(t))
+            {
+                Value::Bool(true)
+            } else if ["false", "0", "no", "off"]
+                .iter()
+                .any(|f| value.eq_ignore_ascii_case(f))
+            {
+                Value::Bool(false)
+            } else {
+                return Err(ValidationError::InvalidType {
                     param: schema.name.clone(),
-                    expected: "number".to_string(),
+                    expected: "boolean".to_string(),
                     actual: value.to_string(),
-                })?,
-            "boolean" | "bool" => match value.to_lowercase().as_str() {
-                "true" | "1" | "yes" | "on" => Value::Bool(true),
-                "false" | "0" | "no" | "off" => Value::Bool(false),
-                _ => {
-                    return Err(ValidationError::InvalidType {
-                        param: schema.name.clone(),
-                        expected: "boolean".to_string(),
-                        actual: value.to_string(),
-                    })
-                }
-            },
-            "email" => {
-                if EMAIL_REGEX.is_match(value) {
-                    Value::String(value.to_string())
-                } else {
-                    return Err(ValidationError::InvalidFormat {
-                        param: schema.name.clone(),
-                        value: value.to_string(),
-                    });
-                }
+                });
             }
-            "uuid" => {
-                if UUID_REGEX.is_match(value) {
-                    Value::String(value.to_string())
-                } else {
-                    return Err(ValidationError::InvalidFormat {
-                        param: schema.name.clone(),
-                        value: value.to_string(),
-                    });
-                }
+        }
+        ParamType::Email => {
+            if EMAIL_REGEX.is_match(value) {
+                Value::String(value.to_string())
+            } else {
+                return Err(ValidationError::InvalidFormat {
+                    param: schema.name.clone(),
+                    value: value.to_string(),
+                });
             }
-            _ => Value::String(value.to_string()),
-        };
+        }
+        ParamType::Uuid => {
+            if UUID_REGEX.is_match(value) {
+                Value::String(value.to_string())
+            } else {
+                return Err(ValidationError::InvalidFormat {
+                    param: schema.name.clone(),
+                    value: value.to_string(),
+                });
+            }
+        }
+    };
 
     // Length validation for strings
     if let Value::String(s) = &converted_value {
@@ -300,10 +348,13 @@ fn validate_single_parameter(value: &str, schema: &ParameterSchema) -> Result<Va
 
         // Pattern validation
         if let Some(pattern) = &schema.pattern {
-            let regex = Regex::new(pattern).map_err(|_| ValidationError::InvalidFormat {
-                param: schema.name.clone(),
-                value: format!("Invalid regex pattern: {}", pattern),
-            })?;
+            let regex =
+                schema
+                    .compiled_pattern(pattern)
+                    .map_err(|_| ValidationError::InvalidFormat {
+                        param: schema.name.clone(),
+                        value: format!("Invalid regex pattern: {}", pattern),
+                    })?;
 
             if !regex.is_match(s) {
                 return Err(ValidationError::PatternMismatch {
@@ -350,6 +401,16 @@ fn validate_single_parameter(value: &str, schema: &ParameterSchema) -> Result<Va
     Ok(converted_value)
 }
 
+fn get_or_compile_pattern(pattern: &str) -> std::result::Result<Arc<Regex>, regex::Error> {
+    if let Some(cached) = PATTERN_CACHE.get(pattern) {
+        return Ok(cached.clone());
+    }
+
+    let regex = Arc::new(Regex::new(pattern)?);
+    PATTERN_CACHE.insert(pattern.to_string(), regex.clone());
+    Ok(regex)
+}
+
 fn validate_json_against_schema(
     value: Value,
     _schema: HashMap<String, Value>,
@@ -361,7 +422,10 @@ fn validate_json_against_schema(
     Ok(ValidationResult::success(validated_data))
 }
 
-fn parse_schema_map(schema: HashMap<String, Value>) -> Result<Vec<ParameterSchema>> {
+/// Parse a raw schema mapping into the form the validators consume. The
+/// result does not depend on the request, so callers should build it once per
+/// route and reuse it.
+pub fn compile_schema(schema: HashMap<String, Value>) -> Result<Vec<ParameterSchema>> {
     let mut schemas = Vec::new();
 
     for (name, spec) in schema {
@@ -369,8 +433,7 @@ fn parse_schema_map(schema: HashMap<String, Value>) -> Result<Vec<ParameterSchem
             let param_type = spec_obj
                 .get("type")
                 .and_then(|v| v.as_str())
-                .unwrap_or("string")
-                .to_string();
+                .unwrap_or("string");
 
             let mut param_schema = ParameterSchema::new(name, param_type);
 
@@ -399,7 +462,14 @@ fn parse_schema_map(schema: HashMap<String, Value>) -> Result<Vec<ParameterSchem
             }
 
             if let Some(Value::String(pattern)) = spec_obj.get("pattern") {
-                param_schema.pattern = Some(pattern.clone());
+                param_schema = param_schema.with_pattern(pattern.clone());
+                // Reject a bad pattern here rather than on every request
+                if param_schema.compiled_pattern(pattern).is_err() {
+                    return Err(ValidationError::InvalidFormat {
+                        param: param_schema.name,
+                        value: format!("Invalid regex pattern: {}", pattern),
+                    });
+                }
             }
 
             if let Some(Value::Array(enum_vals)) = spec_obj.get("enum") {
@@ -427,7 +497,7 @@ mod tests {
 
     #[test]
     fn test_validate_string_parameter() {
-        let schema = ParameterSchema::new("name".to_string(), "string".to_string())
+        let schema = ParameterSchema::new("name".to_string(), "string")
             .required()
             .with_length_range(Some(2), Some(50));
 
@@ -438,8 +508,8 @@ mod tests {
 
     #[test]
     fn test_validate_integer_parameter() {
-        let schema = ParameterSchema::new("age".to_string(), "integer".to_string())
-            .with_range(Some(0.0), Some(150.0));
+        let schema =
+            ParameterSchema::new("age".to_string(), "integer").with_range(Some(0.0), Some(150.0));
 
         assert!(validate_single_parameter("25", &schema).is_ok());
         assert!(validate_single_parameter("-1", &schema).is_err()); // Below minimum
@@ -447,9 +517,22 @@ mod tests {
         assert!(validate_single_parameter("abc", &schema).is_err()); // Invalid type
     }
 
+    #[test]
+    fn test_non_finite_number_is_rejected() {
+        let schema = ParameterSchema::new("x".to_string(), "number");
+
+        assert!(validate_single_parameter("1.5", &schema).is_ok());
+        for value in ["nan", "inf", "-infinity"] {
+            assert!(matches!(
+                validate_single_parameter(value, &schema),
+                Err(ValidationError::InvalidType { .. })
+            ));
+        }
+    }
+
     #[test]
     fn test_validate_email_parameter() {
-        let schema = ParameterSchema::new("email".to_string(), "email".to_string());
+        let schema = ParameterSchema::new("email".to_string(), "email");
 
         assert!(validate_single_parameter("user@example.com", &schema).is_ok());
         assert!(validate_single_parameter("invalid-email", &schema).is_err());
@@ -457,12 +540,11 @@ mod tests {
 
     #[test]
     fn test_validate_enum_parameter() {
-        let schema =
-            ParameterSchema::new("role".to_string(), "string".to_string()).with_enum(vec![
-                "admin".to_string(),
-                "user".to_string(),
-                "guest".to_string(),
-            ]);
+        let schema = ParameterSchema::new("role".to_string(), "string").with_enum(vec![
+            "admin".to_string(),
+            "user".to_string(),
+            "guest".to_string(),
+        ]);
 
         assert!(validate_single_parameter("admin", &schema).is_ok());
         assert!(validate_single_parameter("invalid", &schema).is_err());
@@ -470,7 +552,7 @@ mod tests {
 
     #[test]
     fn test_validate_boolean_parameter() {
-        let schema = ParameterSchema::new("active".to_string(), "boolean".to_string());
+        let schema = ParameterSchema::new("active".to_string(), "boolean");
 
         assert!(validate_single_parameter("true", &schema).is_ok());
         assert!(validate_single_parameter("false", &schema).is_ok());
@@ -481,7 +563,7 @@ mod tests {
 
     #[test]
     fn test_validate_pattern_parameter() {
-        let schema = ParameterSchema::new("code".to_string(), "string".to_string())
+        let schema = ParameterSchema::new("code".to_string(), "string")
             .with_pattern(r"^[A-Z]{3}\d{3}$".to_string());
 
         assert!(validate_single_parameter("ABC123", &schema).is_ok());
@@ -489,15 +571,43 @@ mod tests {
         assert!(validate_single_parameter("ABCD123", &schema).is_err()); // Too many letters
     }
 
+    #[test]
+    fn test_pattern_assigned_directly() {
+        let mut schema = ParameterSchema::new("code".to_string(), "string")
+            .with_pattern(r"^[a-z]+$".to_string());
+        schema.pattern = Some(r"^\d+$".to_string());
+
+        assert!(validate_single_parameter("123", &schema).is_ok());
+        assert!(validate_single_parameter("abc", &schema).is_err());
+    }
+
+    #[test]
+    fn test_invalid_pattern() {
+        let schema =
+            ParameterSchema::new("code".to_string(), "string").with_pattern("[a-".to_string());
+        assert!(matches!(schema.pattern_regex, Some((_, Err(_)))));
+        assert!(matches!(
+            validate_single_parameter("abc", &schema),
+            Err(ValidationError::InvalidFormat { .. })
+        ));
+
+        let mut raw = HashMap::new();
+        raw.insert("code".to_string(), json!({"pattern": "[a-"}));
+        assert!(matches!(
+            compile_schema(raw),
+            Err(ValidationError::InvalidFormat { .. })
+        ));
+    }
+
     #[test]
     fn test_missing_required_parameter() {
         let schema = vec![
-            ParameterSchema::new("name".to_string(), "string".to_string()).required(),
-            ParameterSchema::new("age".to_string(), "integer".to_string()),
+            ParameterSchema::new("name".to_string(), "string").required(),
+            ParameterSchema::new("age".to_string(), "integer"),
         ];
 
         let params = HashMap::new(); // Empty params
-        let result = validate_parameters(params, schema).unwrap();
+        let result = validate_parameters(params, &schema).unwrap();
 
         assert!(!result.valid);
         assert_eq!(result.errors.len(), 1);
@@ -510,13 +620,12 @@ mod tests {
     #[test]
     fn test_default_values() {
         let schema = vec![
-            ParameterSchema::new("page".to_string(), "integer".to_string()).with_default(json!(1)),
-            ParameterSchema::new("limit".to_string(), "integer".to_string())
-                .with_default(json!(10)),
+            ParameterSchema::new("page".to_string(), "integer").with_default(json!(1)),
+            ParameterSchema::new("limit".to_string(), "integer").with_default(json!(10)),
         ];
 
         let params = HashMap::new(); // Empty params
-        let result = validate_parameters(params, schema).unwrap();
+        let result = validate_parameters(params, &schema).unwrap();
 
         assert!(result.valid);
         assert_eq!(result.validated_data.get("page"), Some(&json!(1)));
@@ -525,7 +634,7 @@ mod tests {
 
     #[test]
     fn test_uuid_validation() {
-        let schema = ParameterSchema::new("id".to_string(), "uuid".to_string());
+        let schema = ParameterSchema::new("id".to_string(), "uuid");
 
         let valid_uuid = "550e8400-e29b-41d4-a716-446655440000";
         let invalid_uuid = "not-a-uuid";
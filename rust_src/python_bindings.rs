@@ -1,41 +1,48 @@
 use crate::{core, params, security, serialization, types, utils};
 use pyo3::prelude::*;
 use pyo3::types::{PyAny, PyBytes, PyDict, PyList, PyString};
+use serde_json::Value;
 use std::collections::HashMap;
+use std::sync::Arc;
 
 #[pyfunction]
-pub fn init_rust_backend() -> PyResult<bool> {
-    Ok(true)
+pub fn init_rust_backend() -> bool {
+    true
 }
 
 // Core routing functions
 #[pyfunction]
 pub fn create_api_route(
+    py: Python<'_>,
     path: &str,
     methods: Vec<String>,
     name: Option<String>,
 ) -> PyResult<Py<types::FastApiRoute>> {
-    Python::with_gil(|py| {
-        let route = core::routing::create_route(path, methods, name)?;
-        Py::new(py, types::FastApiRoute::from(route))
-    })
+    let route = core::routing::create_route(path, methods, name)?;
+    Py::new(py, types::FastApiRoute::from(route))
 }
 
+/// Match against a `FastApiRouteTree`, or linearly against a list of routes
 #[pyfunction]
 pub fn match_route(
+    py: Python<'_>,
     path: &str,
     method: &str,
-    routes: Vec<Py<types::FastApiRoute>>,
+    routes: &Bound<PyAny>,
 ) -> PyResult<Option<(usize, HashMap<String, String>)>> {
-    Python::with_gil(|py| {
-        let rust_routes: PyResult<Vec<_>> = routes
-            .iter()
-            .map(|r| r.borrow(py).to_rust_route())
-            .collect();
-        let rust_routes = rust_routes?;
+    if let Ok(tree) = routes.downcast::<types::FastApiRouteTree>() {
+        return Ok(tree.borrow().inner.match_route(path, method));
+    }
 
-        Ok(core::routing::match_route(path, method, &rust_routes))
-    })
+    let routes: Vec<Py<types::FastApiRoute>> = routes.extract()?;
+    // Match against the borrowed routes instead of cloning each one first
+    Ok(routes.iter().enumerate().find_map(|(idx, route)| {
+        route
+            .borrow(py)
+            .inner
+            .match_path(path, method)
+            .map(|params| (idx, params))
+    }))
 }
 
 #[pyfunction]
@@ -45,68 +52,174 @@ pub fn compile_path_regex(path: &str) -> PyResult<String> {
 }
 
 // Parameter validation functions
+#[pyfunction]
+pub fn compile_schema(schema: &Bound<PyDict>) -> PyResult<types::CompiledSchema> {
+    Ok(types::CompiledSchema::from(compile_schema_dict(schema)?))
+}
+
+/// Convert a schema dict into the JSON-like map the validators parse
+fn schema_dict_to_map(schema: &Bound<PyDict>) -> PyResult<HashMap<String, Value>> {
+    let value = serialization::encoders::to_json_value(schema.as_any())
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+    match value {
+        Value::Object(map) => Ok(map.into_iter().collect()),
+        _ => Ok(HashMap::new()),
+    }
+}
+
+fn compile_schema_dict(schema: &Bound<PyDict>) -> PyResult<Vec<params::ParameterSchema>> {
+    params::validation::compile_schema(schema_dict_to_map(schema)?)
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))
+}
+
+/// Accept either a `CompiledSchema` built ahead of time, which is shared
+/// as-is, or a plain dict, which has to be compiled on every call.
+fn resolve_schema(schema: &Bound<PyAny>) -> PyResult<Arc<Vec<params::ParameterSchema>>> {
+    if let Ok(compiled) = schema.downcast::<types::CompiledSchema>() {
+        return Ok(compiled.borrow().inner.clone());
+    }
+    Ok(Arc::new(compile_schema_dict(schema.downcast::<PyDict>()?)?))
+}
+
+/// Pull only the keys the schema declares out of `params`, so unrelated
+/// entries are never converted or copied
+fn extract_schema_params(
+    params: &Bound<PyDict>,
+    schemas: &[params::ParameterSchema],
+) -> PyResult<HashMap<String, String>> {
+    let mut map = HashMap::with_capacity(schemas.len());
+    for schema in schemas {
+        if let Some(value) = params.get_item(&schema.name)? {
+            map.insert(schema.name.clone(), utils::py_any_to_string(&value)?);
+        }
+    }
+    Ok(map)
+}
+
+/// Header names are case-insensitive, so scan the headers once and convert
+/// only the values some schema asks for, keyed by the schema's name
+fn extract_schema_headers(
+    headers: &Bound<PyDict>,
+    schemas: &[params::ParameterSchema],
+) -> PyResult<HashMap<String, String>> {
+    let mut map = HashMap::with_capacity(schemas.len());
+    for (key, value) in headers.iter() {
+        let key = key.str()?;
+        let key = key.to_str()?;
+        if let Some(schema) = schemas
+            .iter()
+            .find(|schema| key.eq_ignore_ascii_case(&schema.name))
+        {
+            map.insert(schema.name.clone(), utils::py_any_to_string(&value)?);
+        }
+    }
+    Ok(map)
+}
+
 #[pyfunction]
 pub fn validate_path_params(
+    py: Python<'_>,
     params: &Bound<PyDict>,
-    schema: &Bound<PyDict>,
+    schema: &Bound<PyAny>,
 ) -> PyResult<Py<types::ValidationResult>> {
-    Python::with_gil(|py| {
-        let param_map = utils::py_dict_to_hashmap(params)?;
-        let schema_map = utils::py_dict_to_hashmap(schema)?;
+    let schemas = resolve_schema(schema)?;
+    let param_map = extract_schema_params(params, &schemas)?;
 
-        let result = params::validation::validate_path_params(param_map, schema_map)?;
-        Py::new(py, types::ValidationResult::from(result))
-    })
+    let result = params::validation::validate_path_params(param_map, &schemas)
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+    Py::new(py, types::ValidationResult::from(result))
 }
 
 #[pyfunction]
 pub fn validate_query_params(
+    py: Python<'_>,
     params: &Bound<PyDict>,
-    schema: &Bound<PyDict>,
+    schema: &Bound<PyAny>,
 ) -> PyResult<Py<types::ValidationResult>> {
-    Python::with_gil(|py| {
-        let param_map = utils::py_dict_to_hashmap(params)?;
-        let schema_map = utils::py_dict_to_hashmap(schema)?;
+    let schemas = resolve_schema(schema)?;
+    let param_map = extract_schema_params(params, &schemas)?;
 
-        let result = params::validation::validate_query_params(param_map, schema_map)?;
-        Py::new(py, types::ValidationResult::from(result))
-    })
+    let result = params::validation::validate_query_params(param_map, &schemas)
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+    Py::new(py, types::ValidationResult::from(result))
 }
 
 #[pyfunction]
 pub fn validate_header_params(
+    py: Python<'_>,
     headers: &Bound<PyDict>,
-    schema: &Bound<PyDict>,
+    schema: &Bound<PyAny>,
 ) -> PyResult<Py<types::ValidationResult>> {
-    Python::with_gil(|py| {
-        let header_map = utils::py_dict_to_hashmap(headers)?;
-        let schema_map = utils::py_dict_to_hashmap(schema)?;
+    let schemas = resolve_schema(schema)?;
+    let header_map = extract_schema_headers(headers, &schemas)?;
 
-        let result = params::validation::validate_header_params(header_map, schema_map)?;
-        Py::new(py, types::ValidationResult::from(result))
-    })
+    let result = params::validation::validate_header_params(header_map, &schemas)
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+    Py::new(py, types::ValidationResult::from(result))
+}
+
+/// Validate a request's path, query and header parameters in one call,
+/// returning one result per location in that order.
+#[pyfunction]
+pub fn validate_request_params(
+    py: Python<'_>,
+    path_params: &Bound<PyDict>,
+    query_params: &Bound<PyDict>,
+    headers: &Bound<PyDict>,
+    path_schema: &Bound<PyAny>,
+    query_schema: &Bound<PyAny>,
+    header_schema: &Bound<PyAny>,
+) -> PyResult<(
+    Py<types::ValidationResult>,
+    Py<types::ValidationResult>,
+    Py<types::ValidationResult>,
+)> {
+    let path_schemas = resolve_schema(path_schema)?;
+    let query_schemas = resolve_schema(query_schema)?;
+    let header_schemas = resolve_schema(header_schema)?;
+
+    let path_map = extract_schema_params(path_params, &path_schemas)?;
+    let query_map = extract_schema_params(query_params, &query_schemas)?;
+    let header_map = extract_schema_headers(headers, &header_schemas)?;
+
+    let path_result = params::validation::validate_path_params(path_map, &path_schemas)
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+    let query_result = params::validation::validate_query_params(query_map, &query_schemas)
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+    let header_result = params::validation::validate_header_params(header_map, &header_schemas)
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+
+    Ok((
+        Py::new(py, types::ValidationResult::from(path_result))?,
+        Py::new(py, types::ValidationResult::from(query_result))?,
+        Py::new(py, types::ValidationResult::from(header_result))?,
+    ))
 }
 
 #[pyfunction]
 pub fn validate_body_params(
+    py: Python<'_>,
     body: &Bound<PyAny>,
     schema: &Bound<PyDict>,
 ) -> PyResult<Py<types::ValidationResult>> {
-    Python::with_gil(|py| {
-        let body_data = if let Ok(bytes) = body.downcast::<PyBytes>() {
-            bytes.as_bytes().to_vec()
-        } else if let Ok(string) = body.downcast::<PyString>() {
-            string.to_str()?.as_bytes().to_vec()
-        } else {
-            return Err(PyErr::new::<pyo3::exceptions::PyTypeError, _>(
-                "Body must be bytes or string",
-            ));
-        };
-
-        let schema_map = utils::py_dict_to_hashmap(schema)?;
-        let result = params::validation::validate_body_params(body_data, schema_map)?;
-        Py::new(py, types::ValidationResult::from(result))
-    })
+    // Borrow the bytes/str buffer instead of copying it; both are immutable
+    // and stay alive for the whole call through `body`.
+    let body_data: &[u8] = if let Ok(bytes) = body.downcast::<PyBytes>() {
+        bytes.as_bytes()
+    } else if let Ok(string) = body.downcast::<PyString>() {
+        string.to_str()?.as_bytes()
+    } else {
+        return Err(PyErr::new::<pyo3::exceptions::PyTypeError, _>(
+            "Body must be bytes or string",
+        ));
+    };
+
+    let schema_map = schema_dict_to_map(schema)?;
+    // Body parsing only touches Rust-owned data, so let other threads run
+    let result = py
+        .allow_threads(|| params::validation::validate_body_params(body_data, schema_map))
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+    Py::new(py, types::ValidationResult::from(result))
 }
 
 // Serialization functions
@@ -124,16 +237,14 @@ pub fn serialize_response(data: &Bound<PyAny>, content_type: Option<&str>) -> Py
 
 #[pyfunction]
 pub fn deserialize_request(body: &Bound<PyBytes>, content_type: &str) -> PyResult<Py<PyAny>> {
-    Python::with_gil(|py| {
-        serialization::decoders::deserialize_request(body.as_bytes(), content_type)
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))
-    })
+    serialization::decoders::deserialize_request(body.as_bytes(), content_type)
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))
 }
 
 // Security functions
 #[pyfunction]
-pub fn constant_time_compare(a: &str, b: &str) -> PyResult<bool> {
-    Ok(security::utils::constant_time_compare(a, b))
+pub fn constant_time_compare(a: &str, b: &str) -> bool {
+    security::utils::constant_time_compare(a, b)
 }
 
 #[pyfunction]
@@ -154,10 +265,8 @@ pub fn hash_password(password: &str, algorithm: Option<&str>) -> PyResult<String
 
 // Utility functions
 #[pyfunction]
-pub fn generate_unique_id(route_name: &str, method: &str, path: &str) -> PyResult<String> {
-    Ok(utils::id_generation::generate_unique_id(
-        route_name, method, path,
-    ))
+pub fn generate_unique_id(route_name: &str, method: &str, path: &str) -> String {
+    utils::id_generation::generate_unique_id(route_name, method, path)
 }
 
 #[pyfunction]
@@ -171,3 +280,76 @@ pub fn convert_python_type(py_obj: &Bound<PyAny>) -> PyResult<String> {
     utils::type_conv::convert_python_type(py_obj)
         .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_validate_query_params_with_compiled_schema() {
+        Python::with_gil(|py| {
+            let spec = PyDict::new_bound(py);
+            spec.set_item("type", "integer").unwrap();
+            spec.set_item("required", true).unwrap();
+            let schema = PyDict::new_bound(py);
+            schema.set_item("limit", spec).unwrap();
+            let compiled = Bound::new(py, compile_schema(&schema).unwrap()).unwrap();
+
+            let params = PyDict::new_bound(py);
+            params.set_item("limit", "10").unwrap();
+            params.set_item("unrelated", "x").unwrap();
+            let result = validate_query_params(py, &params, compiled.as_any()).unwrap();
+            let result = result.borrow(py);
+            assert!(result.valid);
+            assert_eq!(result.validated_data.get("limit"), Some(&Value::from(10)));
+            assert_eq!(result.validated_data.len(), 1);
+
+            params.set_item("limit", "ten").unwrap();
+            let result = validate_query_params(py, &params, compiled.as_any()).unwrap();
+            assert!(!result.borrow(py).valid);
+        });
+    }
+
+    #[test]
+    fn test_validate_request_params_per_location() {
+        Python::with_gil(|py| {
+            let id_spec = PyDict::new_bound(py);
+            id_spec.set_item("type", "integer").unwrap();
+            let path_schema = PyDict::new_bound(py);
+            path_schema.set_item("id", id_spec).unwrap();
+            let token_spec = PyDict::new_bound(py);
+            token_spec.set_item("required", true).unwrap();
+            let header_schema = PyDict::new_bound(py);
+            header_schema.set_item("X-Token", token_spec).unwrap();
+            let header_schema = Bound::new(py, compile_schema(&header_schema).unwrap()).unwrap();
+
+            let path_params = PyDict::new_bound(py);
+            path_params.set_item("id", "7").unwrap();
+            let headers = PyDict::new_bound(py);
+            headers.set_item("x-token", "secret").unwrap();
+            let empty = PyDict::new_bound(py);
+
+            let (path, query, header) = validate_request_params(
+                py,
+                &path_params,
+                &empty,
+                &headers,
+                path_schema.as_any(),
+                empty.as_any(),
+                header_schema.as_any(),
+            )
+            .unwrap();
+
+            let path = path.borrow(py);
+            assert!(path.valid);
+            assert_eq!(path.validated_data.get("id"), Some(&Value::from(7)));
+            assert!(query.borrow(py).validated_data.is_empty());
+            let header = header.borrow(py);
+            assert!(header.valid);
+            assert_eq!(
+                header.validated_data.get("X-Token"),
+                Some(&Value::from("secret"))
+            );
+        });
+    }
+}
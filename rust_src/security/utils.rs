@@ -1,3 +1,5 @@
+use rand::distributions::Uniform;
+use rand::{Rng, RngCore};
 use std::time::{SystemTime, UNIX_EPOCH};
 use thiserror::Error;
 
@@ -86,28 +88,12 @@ pub fn hash_password(password: &str, algorithm: Option<&str>) -> Result<String>
 }
 
 /// Generate cryptographically secure random bytes
+///
+/// Draws from the thread-local ChaCha12 generator, which is seeded from the OS
+/// once per thread instead of on every call.
 pub fn generate_random_bytes(length: usize) -> Vec<u8> {
-    use std::collections::hash_map::DefaultHasher;
-    use std::hash::{Hash, Hasher};
-
-    let mut bytes = Vec::with_capacity(length);
-    let mut hasher = DefaultHasher::new();
-
-    // Use current time as seed
-    let now = SystemTime::now()
-        .duration_since(UNIX_EPOCH)
-        .unwrap()
-        .as_nanos();
-    now.hash(&mut hasher);
-
-    let mut seed = hasher.finish();
-
-    for _ in 0..length {
-        // Simple LCG for demonstration (use proper CSPRNG in production)
-        seed = seed.wrapping_mul(1103515245).wrapping_add(12345);
-        bytes.push((seed >> 16) as u8);
-    }
-
+    let mut bytes = vec![0u8; length];
+    rand::thread_rng().fill_bytes(&mut bytes);
     bytes
 }
 
@@ -171,15 +157,18 @@ pub fn generate_secure_random_string(length: usize, charset: Option<&str>) -> St
     let chars = charset.unwrap_or(default_charset);
     let char_bytes = chars.as_bytes();
 
-    let random_bytes = generate_random_bytes(length);
-    let mut result = String::with_capacity(length);
-
-    for byte in random_bytes {
-        let index = (byte as usize) % char_bytes.len();
-        result.push(char_bytes[index] as char);
+    if char_bytes.is_empty() {
+        return String::new();
     }
 
-    result
+    // Uniform rejection-samples, so every character is equally likely; a
+    // byte reduced onto the charset would favour some characters
+    let index = Uniform::from(0..char_bytes.len());
+    rand::thread_rng()
+        .sample_iter(index)
+        .take(length)
+        .map(|i| char_bytes[i] as char)
+        .collect()
 }
 
 /// Timing-safe operation wrapper
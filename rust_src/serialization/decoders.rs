@@ -31,15 +31,24 @@ pub fn deserialize_request(body: &[u8], content_type: &str) -> Result<Py<PyAny>>
 
 /// Deserialize JSON body to Python object
 fn deserialize_json(body: &[u8], py: Python) -> Result<Py<PyAny>> {
-    let body_str =
-        std::str::from_utf8(body).map_err(|e| DecodingError::EncodingError(e.to_string()))?;
-
-    let json_value: Value =
-        serde_json::from_str(body_str).map_err(|e| DecodingError::InvalidJson(e.to_string()))?;
+    let json_value = parse_json_slice(body, |e| e.to_string(), |e| e.to_string())?;
 
     json_to_python(&json_value, py)
 }
 
+/// Parse JSON straight from bytes. serde_json validates UTF-8 as it goes, so
+/// a separate `from_utf8` pass is only run to classify a failure.
+fn parse_json_slice(
+    body: &[u8],
+    utf8_message: impl FnOnce(std::str::Utf8Error) -> String,
+    json_message: impl FnOnce(serde_json::Error) -> String,
+) -> Result<Value> {
+    serde_json::from_slice(body).map_err(|e| match std::str::from_utf8(body) {
+        Err(utf8_error) => DecodingError::EncodingError(utf8_message(utf8_error)),
+        Ok(_) => DecodingError::InvalidJson(json_message(e)),
+    })
+}
+
 /// Deserialize form data to Python dict
 fn deserialize_form_data(body: &[u8], py: Python) -> Result<Py<PyAny>> {
     let body_str =
@@ -136,12 +145,11 @@ pub fn fast_parse_json_string(json_str: &str) -> Result<Value> {
 
 /// Parse JSON with custom error handling
 pub fn parse_json_with_context(body: &[u8], context: &str) -> Result<Value> {
-    let body_str = std::str::from_utf8(body).map_err(|e| {
-        DecodingError::EncodingError(format!("Invalid UTF-8 in {}: {}", context, e))
-    })?;
-
-    serde_json::from_str(body_str)
-        .map_err(|e| DecodingError::InvalidJson(format!("JSON parse error in {}: {}", context, e)))
+    parse_json_slice(
+        body,
+        |e| format!("Invalid UTF-8 in {}: {}", context, e),
+        |e| format!("JSON parse error in {}: {}", context, e),
+    )
 }
 
 #[cfg(test)]
@@ -1,8 +1,10 @@
 use bytes::Bytes;
 use chrono::{DateTime, NaiveDateTime, Utc};
 use pyo3::prelude::*;
+use pyo3::sync::GILOnceCell;
 use pyo3::types::{
-    PyAny, PyBool, PyBytes, PyDict, PyFloat, PyInt, PyList, PyNone, PyString, PyTuple,
+    PyAny, PyBool, PyBytes, PyDict, PyFloat, PyFrozenSet, PyInt, PyList, PyNone, PySet, PyString,
+    PyTuple, PyType,
 };
 use serde_json::{Map, Value};
 use std::collections::HashMap;
@@ -18,22 +20,47 @@ pub enum EncodingError {
     InvalidDatetime(String),
     #[error("Circular reference detected")]
     CircularReference,
+    #[error("Maximum nesting depth of {0} exceeded")]
+    MaxDepthExceeded(usize),
 }
 
 pub type Result<T> = std::result::Result<T, EncodingError>;
 
+/// Deepest container nesting the encoder will follow before giving up,
+/// well below what would exhaust the native stack
+const MAX_NESTING_DEPTH: usize = 256;
+
+static DATETIME_TYPE: GILOnceCell<Py<PyType>> = GILOnceCell::new();
+static ENUM_TYPE: GILOnceCell<Py<PyType>> = GILOnceCell::new();
+static DATE_TYPE: GILOnceCell<Py<PyType>> = GILOnceCell::new();
+static TIME_TYPE: GILOnceCell<Py<PyType>> = GILOnceCell::new();
+static TIMEDELTA_TYPE: GILOnceCell<Py<PyType>> = GILOnceCell::new();
+static UUID_TYPE: GILOnceCell<Py<PyType>> = GILOnceCell::new();
+static DECIMAL_TYPE: GILOnceCell<Py<PyType>> = GILOnceCell::new();
+
 pub fn jsonable_encoder(obj: &Bound<PyAny>) -> Result<String> {
-    let value = python_to_json_value(obj, &mut std::collections::HashSet::new())?;
+    let value = to_json_value(obj)?;
     serde_json::to_string(&value).map_err(|e| EncodingError::SerializationError(e.to_string()))
 }
 
+/// Convert a Python object into a `serde_json::Value` tree
+pub fn to_json_value(obj: &Bound<PyAny>) -> Result<Value> {
+    python_to_json_value(obj, &mut std::collections::HashSet::new())
+}
+
 pub fn serialize_response(data: &Bound<PyAny>, content_type: Option<&str>) -> Result<Vec<u8>> {
     match content_type {
         Some("application/json") | None => {
-            let json_str = jsonable_encoder(data)?;
-            Ok(json_str.into_bytes())
+            let value = to_json_value(data)?;
+            serde_json::to_vec(&value).map_err(|e| EncodingError::SerializationError(e.to_string()))
         }
         Some("text/plain") => {
+            if let Ok(s) = data.downcast::<PyString>() {
+                let text = s
+                    .to_str()
+                    .map_err(|e| EncodingError::SerializationError(e.to_string()))?;
+                return Ok(text.as_bytes().to_vec());
+            }
             let text = data
                 .str()
                 .map_err(|e| EncodingError::SerializationError(e.to_string()))?
@@ -61,18 +88,18 @@ fn python_to_json_value(
     obj: &Bound<PyAny>,
     visited: &mut std::collections::HashSet<usize>,
 ) -> Result<Value> {
-    // Prevent infinite recursion
-    let obj_id = obj.as_ptr() as usize;
-    if visited.contains(&obj_id) {
-        return Err(EncodingError::CircularReference);
-    }
-
     // Handle None
     if obj.is_none() {
         return Ok(Value::Null);
     }
 
-    // Handle basic types first for performance
+    // Handle basic types first for performance. Each downcast is a single
+    // type-flag test; bool goes first because it subclasses int and would
+    // otherwise be encoded as 0/1.
+    if let Ok(b) = obj.downcast::<PyBool>() {
+        return Ok(Value::Bool(b.is_true()));
+    }
+
     if let Ok(s) = obj.downcast::<PyString>() {
         let text = s
             .to_str()
@@ -96,41 +123,83 @@ fn python_to_json_value(
         return Ok(Value::Number(json_num));
     }
 
-    if let Ok(b) = obj.downcast::<PyBool>() {
-        let val = b
-            .extract::<bool>()
-            .map_err(|e| EncodingError::SerializationError(e.to_string()))?;
-        return Ok(Value::Bool(val));
-    }
-
-    visited.insert(obj_id);
-
-    let result = if let Ok(dict) = obj.downcast::<PyDict>() {
-        encode_dict(dict, visited)
-    } else if let Ok(list) = obj.downcast::<PyList>() {
-        encode_list(list, visited)
-    } else if let Ok(tuple) = obj.downcast::<PyTuple>() {
-        encode_tuple(tuple, visited)
-    } else if let Ok(bytes) = obj.downcast::<PyBytes>() {
-        encode_bytes(bytes)
-    } else if is_datetime(obj) {
-        encode_datetime(obj)
-    } else if has_dict_method(obj) {
-        encode_object_with_dict(obj, visited)
-    } else if is_enum(obj) {
-        encode_enum(obj)
-    } else if is_pydantic_model(obj) {
-        encode_pydantic_model(obj, visited)
-    } else {
-        // Fallback to string representation
-        let str_repr = obj
-            .str()
-            .map_err(|e| EncodingError::SerializationError(e.to_string()))?
-            .to_str()
-            .map_err(|e| EncodingError::SerializationError(e.to_string()))?;
-        Ok(Value::String(str_repr.to_string()))
-    };
+    // Builtin containers are recognised from type flags alone, so they are
+    // tested before the costlier leaf probes below
+    if let Ok(dict) = obj.downcast::<PyDict>() {
+        return encode_guarded(obj, visited, |visited| encode_dict(dict, visited));
+    }
+    if let Ok(list) = obj.downcast::<PyList>() {
+        return encode_guarded(obj, visited, |visited| {
+            encode_sequence(list.iter(), list.len(), visited)
+        });
+    }
+    if let Ok(tuple) = obj.downcast::<PyTuple>() {
+        return encode_guarded(obj, visited, |visited| {
+            encode_sequence(tuple.iter(), tuple.len(), visited)
+        });
+    }
+    if let Ok(set) = obj.downcast::<PySet>() {
+        return encode_guarded(obj, visited, |visited| {
+            encode_sequence(set.iter(), set.len(), visited)
+        });
+    }
+    if let Ok(set) = obj.downcast::<PyFrozenSet>() {
+        return encode_guarded(obj, visited, |visited| {
+            encode_sequence(set.iter(), set.len(), visited)
+        });
+    }
+
+    // Other leaves: exact-type and cached-class checks, no cycle tracking
+    if let Ok(bytes) = obj.downcast::<PyBytes>() {
+        return encode_bytes(bytes);
+    }
+
+    if is_str_leaf(obj) {
+        return encode_as_str(obj);
+    }
+
+    if is_datetime(obj) {
+        return encode_datetime(obj);
+    }
+
+    // Enum members carry a `__dict__`, so they must be caught before the
+    // generic object branch below
+    if is_enum(obj) {
+        return encode_enum(obj);
+    }
+
+    encode_guarded(obj, visited, |visited| {
+        if is_pydantic_v2_model(obj) {
+            encode_pydantic_v2_model(obj, visited)
+        } else if is_pydantic_model(obj) {
+            encode_pydantic_model(obj, visited)
+        } else if has_dict_method(obj) {
+            encode_object_with_dict(obj, visited)
+        } else {
+            // Fallback to string representation
+            encode_as_str(obj)
+        }
+    })
+}
+
+/// Run `encode` for a container or object that may nest back into itself,
+/// enforcing the depth limit and rejecting cycles. `visited` holds exactly
+/// the containers currently being encoded, so its size is the nesting depth.
+fn encode_guarded(
+    obj: &Bound<PyAny>,
+    visited: &mut std::collections::HashSet<usize>,
+    encode: impl FnOnce(&mut std::collections::HashSet<usize>) -> Result<Value>,
+) -> Result<Value> {
+    if visited.len() >= MAX_NESTING_DEPTH {
+        return Err(EncodingError::MaxDepthExceeded(MAX_NESTING_DEPTH));
+    }
 
+    let obj_id = obj.as_ptr() as usize;
+    if !visited.insert(obj_id) {
+        return Err(EncodingError::CircularReference);
+    }
+
+    let result = encode(visited);
     visited.remove(&obj_id);
     result
 }
@@ -161,13 +230,15 @@ fn encode_dict(
     Ok(Value::Object(map))
 }
 
-fn encode_list(
-    list: &Bound<PyList>,
+/// Encode any Python sequence or set as a JSON array, sized up front
+fn encode_sequence<'py>(
+    items: impl Iterator<Item = Bound<'py, PyAny>>,
+    len: usize,
     visited: &mut std::collections::HashSet<usize>,
 ) -> Result<Value> {
-    let mut vec = Vec::with_capacity(list.len());
+    let mut vec = Vec::with_capacity(len);
 
-    for item in list.iter() {
+    for item in items {
         let json_value = python_to_json_value(&item, visited)?;
         vec.push(json_value);
     }
@@ -175,18 +246,13 @@ fn encode_list(
     Ok(Value::Array(vec))
 }
 
-fn encode_tuple(
-    tuple: &Bound<PyTuple>,
-    visited: &mut std::collections::HashSet<usize>,
-) -> Result<Value> {
-    let mut vec = Vec::with_capacity(tuple.len());
-
-    for item in tuple.iter() {
-        let json_value = python_to_json_value(&item, visited)?;
-        vec.push(json_value);
-    }
-
-    Ok(Value::Array(vec))
+fn encode_as_str(obj: &Bound<PyAny>) -> Result<Value> {
+    let str_repr = obj
+        .str()
+        .map_err(|e| EncodingError::SerializationError(e.to_string()))?
+        .to_str()
+        .map_err(|e| EncodingError::SerializationError(e.to_string()))?;
+    Ok(Value::String(str_repr.to_string()))
 }
 
 fn encode_bytes(bytes: &Bound<PyBytes>) -> Result<Value> {
@@ -195,25 +261,23 @@ fn encode_bytes(bytes: &Bound<PyBytes>) -> Result<Value> {
 }
 
 fn encode_datetime(obj: &Bound<PyAny>) -> Result<Value> {
-    Python::with_gil(|py| {
-        // Try to get ISO format string
-        if let Ok(isoformat) = obj.call_method0("isoformat") {
-            let iso_str = isoformat
-                .str()
-                .map_err(|e| EncodingError::SerializationError(e.to_string()))?
-                .to_str()
-                .map_err(|e| EncodingError::SerializationError(e.to_string()))?;
-            return Ok(Value::String(iso_str.to_string()));
-        }
-
-        // Fallback to string representation
-        let str_repr = obj
+    // Try to get ISO format string
+    if let Ok(isoformat) = obj.call_method0("isoformat") {
+        let iso_str = isoformat
             .str()
             .map_err(|e| EncodingError::SerializationError(e.to_string()))?
             .to_str()
             .map_err(|e| EncodingError::SerializationError(e.to_string()))?;
-        Ok(Value::String(str_repr.to_string()))
-    })
+        return Ok(Value::String(iso_str.to_string()));
+    }
+
+    // Fallback to string representation
+    let str_repr = obj
+        .str()
+        .map_err(|e| EncodingError::SerializationError(e.to_string()))?
+        .to_str()
+        .map_err(|e| EncodingError::SerializationError(e.to_string()))?;
+    Ok(Value::String(str_repr.to_string()))
 }
 
 fn encode_object_with_dict(
@@ -259,6 +323,29 @@ fn encode_enum(obj: &Bound<PyAny>) -> Result<Value> {
     Ok(Value::String(str_repr.to_string()))
 }
 
+/// Dump a pydantic v2 model or pydantic dataclass through the type's own
+/// serializer in Python mode, which works for both where `model_dump` only
+/// exists on models. The result is walked by this encoder like any dict, so
+/// bytes, timedeltas and datetimes come out exactly as they do outside a
+/// model; pydantic-core's JSON mode formats those differently.
+fn encode_pydantic_v2_model(
+    obj: &Bound<PyAny>,
+    visited: &mut std::collections::HashSet<usize>,
+) -> Result<Value> {
+    let dumped = obj
+        .get_type()
+        .getattr("__pydantic_serializer__")
+        .and_then(|serializer| serializer.call_method1("to_python", (obj,)));
+
+    if let Ok(dumped) = dumped {
+        if let Ok(dict) = dumped.downcast::<PyDict>() {
+            return encode_dict(dict, visited);
+        }
+    }
+
+    encode_pydantic_model(obj, visited)
+}
+
 fn encode_pydantic_model(
     obj: &Bound<PyAny>,
     visited: &mut std::collections::HashSet<usize>,
@@ -285,34 +372,73 @@ fn encode_pydantic_model(
     encode_object_with_dict(obj, visited)
 }
 
-fn is_datetime(obj: &Bound<PyAny>) -> bool {
-    Python::with_gil(|py| {
-        if let Ok(datetime_module) = py.import("datetime") {
-            if let Ok(datetime_class) = datetime_module.getattr("datetime") {
-                return obj.is_instance(&datetime_class).unwrap_or(false);
-            }
-        }
-        false
+/// Look up `module.name` once per interpreter and reuse the class afterwards
+fn cached_type<'py>(
+    cell: &'static GILOnceCell<Py<PyType>>,
+    py: Python<'py>,
+    module: &str,
+    name: &str,
+) -> PyResult<&'py Bound<'py, PyType>> {
+    cell.get_or_try_init(py, || {
+        let class = py.import_bound(module)?.getattr(name)?;
+        Ok::<_, PyErr>(class.downcast_into::<PyType>()?.unbind())
+    })
+    .map(|class| class.bind(py))
+}
+
+fn is_instance_of_cached(
+    obj: &Bound<PyAny>,
+    cell: &'static GILOnceCell<Py<PyType>>,
+    module: &str,
+    name: &str,
+) -> bool {
+    cached_type(cell, obj.py(), module, name)
+        .and_then(|class| obj.is_instance(class))
+        .unwrap_or(false)
+}
+
+/// Standard-library value types whose `str()` is already their JSON form.
+/// They are matched by exact type, so they skip the `__dict__`, Enum and
+/// model attribute probes that would all fail for them anyway.
+fn is_str_leaf(obj: &Bound<PyAny>) -> bool {
+    let py = obj.py();
+    let obj_type = obj.get_type();
+    [
+        (&DATE_TYPE, "datetime", "date"),
+        (&TIME_TYPE, "datetime", "time"),
+        (&TIMEDELTA_TYPE, "datetime", "timedelta"),
+        (&UUID_TYPE, "uuid", "UUID"),
+        (&DECIMAL_TYPE, "decimal", "Decimal"),
+    ]
+    .into_iter()
+    .any(|(cell, module, name)| {
+        cached_type(cell, py, module, name).map_or(false, |class| obj_type.is(class))
     })
 }
 
+fn is_datetime(obj: &Bound<PyAny>) -> bool {
+    is_instance_of_cached(obj, &DATETIME_TYPE, "datetime", "datetime")
+}
+
 fn has_dict_method(obj: &Bound<PyAny>) -> bool {
     obj.hasattr("__dict__").unwrap_or(false)
 }
 
 fn is_enum(obj: &Bound<PyAny>) -> bool {
-    Python::with_gil(|py| {
-        if let Ok(enum_module) = py.import("enum") {
-            if let Ok(enum_class) = enum_module.getattr("Enum") {
-                return obj.is_instance(&enum_class).unwrap_or(false);
-            }
-        }
-        false
-    })
+    is_instance_of_cached(obj, &ENUM_TYPE, "enum", "Enum")
+}
+
+fn is_pydantic_v2_model(obj: &Bound<PyAny>) -> bool {
+    obj.get_type()
+        .hasattr("__pydantic_serializer__")
+        .unwrap_or(false)
 }
 
+/// Pydantic v1 models are recognised by `dict()` together with `__fields__`,
+/// so unrelated objects that merely have a `dict` attribute are not called
 fn is_pydantic_model(obj: &Bound<PyAny>) -> bool {
-    obj.hasattr("model_dump").unwrap_or(false) || obj.hasattr("dict").unwrap_or(false)
+    obj.hasattr("model_dump").unwrap_or(false)
+        || (obj.hasattr("dict").unwrap_or(false) && obj.hasattr("__fields__").unwrap_or(false))
 }
 
 // Fast path encoders for common types
@@ -409,4 +535,117 @@ mod tests {
             }
         });
     }
+
+    #[test]
+    fn test_encode_set_as_array() {
+        Python::with_gil(|py| {
+            let set = PySet::new_bound(py, &[7]).unwrap();
+
+            let result =
+                python_to_json_value(&set.as_any(), &mut std::collections::HashSet::new()).unwrap();
+            assert_eq!(result, Value::Array(vec![Value::Number(7.into())]));
+        });
+    }
+
+    #[test]
+    fn test_encode_rejects_excessive_nesting() {
+        Python::with_gil(|py| {
+            let mut nested = PyList::empty_bound(py);
+            for _ in 0..=MAX_NESTING_DEPTH {
+                nested = PyList::new_bound(py, [nested]);
+            }
+
+            let result =
+                python_to_json_value(&nested.as_any(), &mut std::collections::HashSet::new());
+            assert!(matches!(result, Err(EncodingError::MaxDepthExceeded(_))));
+        });
+    }
+    fn encode_from_script(py: Python<'_>, script: &str) -> Result<Value> {
+        let globals = PyDict::new_bound(py);
+        py.run_bound(script, Some(&globals), None).unwrap();
+        let obj = globals.get_item("obj").unwrap().unwrap();
+        python_to_json_value(&obj, &mut std::collections::HashSet::new())
+    }
+
+    #[test]
+    fn test_encode_pydantic_dataclass() {
+        Python::with_gil(|py| {
+            let result = encode_from_script(
+                py,
+                r#"
+import pydantic
+
+@pydantic.dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+obj = Point(x=1, y=2)
+"#,
+            )
+            .unwrap();
+            assert_eq!(result, serde_json::json!({"x": 1, "y": 2}));
+        });
+    }
+
+    #[test]
+    fn test_encode_pydantic_model_with_arbitrary_type() {
+        Python::with_gil(|py| {
+            let result = encode_from_script(
+                py,
+                r#"
+import pydantic
+
+class Opaque:
+    __slots__ = ()
+
+    def __str__(self):
+        return "opaque"
+
+class Holder(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
+    name: str
+    value: Opaque
+
+obj = Holder(name="a", value=Opaque())
+"#,
+            )
+            .unwrap();
+            assert_eq!(result, serde_json::json!({"name": "a", "value": "opaque"}));
+        });
+    }
+    #[test]
+    fn test_pydantic_fast_path_matches_fallback_and_plain_dict() {
+        Python::with_gil(|py| {
+            let globals = PyDict::new_bound(py);
+            py.run_bound(
+                r#"
+import datetime
+import pydantic
+
+class Event(pydantic.BaseModel):
+    data: bytes
+    gap: datetime.timedelta
+
+obj = Event(data=b"\x00\xff", gap=datetime.timedelta(hours=1))
+plain = {"data": b"\x00\xff", "gap": datetime.timedelta(hours=1)}
+"#,
+                Some(&globals),
+                None,
+            )
+            .unwrap();
+            let obj = globals.get_item("obj").unwrap().unwrap();
+            let plain = globals.get_item("plain").unwrap().unwrap();
+
+            let fast = python_to_json_value(&obj, &mut std::collections::HashSet::new()).unwrap();
+            let fallback =
+                encode_pydantic_model(&obj, &mut std::collections::HashSet::new()).unwrap();
+            let expected =
+                python_to_json_value(&plain, &mut std::collections::HashSet::new()).unwrap();
+
+            assert_eq!(fast, expected);
+            assert_eq!(fallback, expected);
+        });
+    }
 }
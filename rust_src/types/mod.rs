@@ -1,10 +1,11 @@
 pub mod models;
 
-use crate::core::Route;
-use crate::params::ValidationResult as RustValidationResult;
+use crate::core::{Route, RouteTree};
+use crate::params::{ParameterSchema, ValidationResult as RustValidationResult};
 use pyo3::prelude::*;
 use serde_json::Value;
 use std::collections::HashMap;
+use std::sync::Arc;
 
 #[pyclass]
 #[derive(Debug, Clone)]
@@ -57,6 +58,11 @@ impl FastApiRoute {
         }
     }
 
+    /// Single-pass alternative to `matches` followed by `extract_params`.
+    pub fn match_path(&self, path: &str, method: &str) -> Option<HashMap<String, String>> {
+        self.inner.match_path(path, method)
+    }
+
     fn __repr__(&self) -> String {
         format!(
             "FastApiRoute(path='{}', methods={:?}, name={:?})",
@@ -81,6 +87,44 @@ impl FastApiRoute {
     }
 }
 
+/// Routes kept in registration order behind an index, so `match_route`
+/// resolves static paths by lookup and dynamic ones through a single
+/// combined regex scan
+#[pyclass]
+#[derive(Default)]
+pub struct FastApiRouteTree {
+    pub(crate) inner: RouteTree,
+}
+
+#[pymethods]
+impl FastApiRouteTree {
+    #[new]
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// Append `route`, returning the index `match_route` reports for it
+    pub fn add_route(&mut self, route: PyRef<FastApiRoute>) -> usize {
+        self.inner.insert(route.inner.clone())
+    }
+
+    pub fn match_route(
+        &self,
+        path: &str,
+        method: &str,
+    ) -> Option<(usize, HashMap<String, String>)> {
+        self.inner.match_route(path, method)
+    }
+
+    fn __len__(&self) -> usize {
+        self.inner.len()
+    }
+
+    fn __repr__(&self) -> String {
+        format!("FastApiRouteTree(routes={})", self.inner.len())
+    }
+}
+
 #[pyclass]
 #[derive(Debug, Clone)]
 pub struct ValidationResult {
@@ -136,6 +180,36 @@ impl ValidationResult {
     }
 }
 
+/// Parameter schema compiled once, typically when a route is registered,
+/// and passed to the `validate_*_params` functions in place of the raw dict.
+#[pyclass]
+#[derive(Debug, Clone)]
+pub struct CompiledSchema {
+    pub(crate) inner: Arc<Vec<ParameterSchema>>,
+}
+
+#[pymethods]
+impl CompiledSchema {
+    fn __len__(&self) -> usize {
+        self.inner.len()
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "CompiledSchema(params={:?})",
+            self.inner.iter().map(|s| &s.name).collect::<Vec<_>>()
+        )
+    }
+}
+
+impl CompiledSchema {
+    pub fn from(schemas: Vec<ParameterSchema>) -> Self {
+        CompiledSchema {
+            inner: Arc::new(schemas),
+        }
+    }
+}
+
 #[pyclass]
 #[derive(Debug, Clone)]
 pub struct RequestData {
@@ -1,3 +1,4 @@
+use rand::RngCore;
 use std::collections::hash_map::DefaultHasher;
 use std::hash::{Hash, Hasher};
 
@@ -88,30 +89,15 @@ fn snake_case(input: &str) -> String {
     result
 }
 
-/// Generate UUID-like identifier
+/// Generate random (version 4) UUID
 pub fn generate_uuid() -> String {
-    use std::time::{SystemTime, UNIX_EPOCH};
+    let mut bytes = [0u8; 16];
+    rand::thread_rng().fill_bytes(&mut bytes);
 
-    let now = SystemTime::now()
-        .duration_since(UNIX_EPOCH)
-        .unwrap()
-        .as_nanos();
-
-    let mut hasher = DefaultHasher::new();
-    now.hash(&mut hasher);
-    let hash1 = hasher.finish();
-
-    (hash1 ^ 0x123456789abcdef0).hash(&mut hasher);
-    let hash2 = hasher.finish();
-
-    format!(
-        "{:08x}-{:04x}-{:04x}-{:04x}-{:012x}",
-        (hash1 >> 32) as u32,
-        (hash1 >> 16) as u16,
-        hash1 as u16,
-        (hash2 >> 48) as u16,
-        hash2 & 0xffffffffffff
-    )
+    uuid::Builder::from_random_bytes(bytes)
+        .into_uuid()
+        .hyphenated()
+        .to_string()
 }
 
 /// Generate short hash for identifiers
@@ -230,6 +216,7 @@ mod tests {
         assert_ne!(uuid1, uuid2);
         assert_eq!(uuid1.len(), 36); // Standard UUID format length
         assert!(uuid1.contains('-'));
+        assert_eq!(&uuid1[14..15], "4"); // Version 4 (random) UUID
     }
 
     #[test]
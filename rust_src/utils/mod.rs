@@ -4,7 +4,7 @@ pub mod id_generation;
 pub mod type_conv;
 
 use pyo3::prelude::*;
-use pyo3::types::PyDict;
+use pyo3::types::{PyDict, PyString};
 use std::collections::HashMap;
 
 pub use async_tools::*;
@@ -14,13 +14,20 @@ pub use type_conv::*;
 
 /// Convert Python dict to Rust HashMap
 pub fn py_dict_to_hashmap(dict: &Bound<PyDict>) -> PyResult<HashMap<String, String>> {
-    let mut map = HashMap::new();
+    let mut map = HashMap::with_capacity(dict.len());
 
     for (key, value) in dict.iter() {
-        let key_str = key.str()?.to_str()?.to_string();
-        let value_str = value.str()?.to_str()?.to_string();
-        map.insert(key_str, value_str);
+        map.insert(py_any_to_string(&key)?, py_any_to_string(&value)?);
     }
 
     Ok(map)
 }
+
+/// `str(obj)` as a Rust String, reading exact `str` objects directly since path,
+/// query and header values almost always already are one
+pub fn py_any_to_string(obj: &Bound<PyAny>) -> PyResult<String> {
+    match obj.downcast_exact::<PyString>() {
+        Ok(s) => Ok(s.to_str()?.to_string()),
+        Err(_) => Ok(obj.str()?.to_str()?.to_string()),
+    }
+}
@@ -223,6 +223,11 @@ pub fn python_to_rust_value(py_obj: &Bound<PyAny>) -> Result<RustValue> {
         return Ok(RustValue::None);
     }
 
+    // bool subclasses int, so it has to be matched before PyInt
+    if let Ok(b) = py_obj.downcast::<PyBool>() {
+        return Ok(RustValue::Boolean(b.is_true()));
+    }
+
     if let Ok(s) = py_obj.downcast::<PyString>() {
         let text = s
             .to_str()
@@ -244,15 +249,8 @@ pub fn python_to_rust_value(py_obj: &Bound<PyAny>) -> Result<RustValue> {
         return Ok(RustValue::Float(num));
     }
 
-    if let Ok(b) = py_obj.downcast::<PyBool>() {
-        let val = b
-            .extract::<bool>()
-            .map_err(|e| TypeConversionError::ConversionFailed(e.to_string()))?;
-        return Ok(RustValue::Boolean(val));
-    }
-
     if let Ok(list) = py_obj.downcast::<PyList>() {
-        let mut items = Vec::new();
+        let mut items = Vec::with_capacity(list.len());
         for item in list.iter() {
             items.push(python_to_rust_value(&item)?);
         }
@@ -260,14 +258,10 @@ pub fn python_to_rust_value(py_obj: &Bound<PyAny>) -> Result<RustValue> {
     }
 
     if let Ok(dict) = py_obj.downcast::<PyDict>() {
-        let mut map = std::collections::HashMap::new();
+        let mut map = std::collections::HashMap::with_capacity(dict.len());
         for (key, value) in dict.iter() {
-            let key_str = key
-                .str()
-                .map_err(|e| TypeConversionError::ConversionFailed(e.to_string()))?
-                .to_str()
-                .map_err(|e| TypeConversionError::ConversionFailed(e.to_string()))?
-                .to_string();
+            let key_str = crate::utils::py_any_to_string(&key)
+                .map_err(|e| TypeConversionError::ConversionFailed(e.to_string()))?;
             map.insert(key_str, python_to_rust_value(&value)?);
         }
         return Ok(RustValue::Object(map));